@@ -3,21 +3,176 @@ Enhanced Text-to-Speech service with multilingual support
 Uses espeak-ng for reliable cross-platform TTS with Hindi and English support
 """
 
-import io
+import ctypes
+import ctypes.util
+import hashlib
 import os
+import re
+import struct
 import subprocess
 import tempfile
-import wave
+import threading
+from collections import OrderedDict
+from pathlib import Path
 import numpy as np
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterator, List, Tuple
 import time
 
+# libespeak-ng API constants (speak_lib.h)
+AUDIO_OUTPUT_SYNCHRONOUS = 2
+ESPEAK_RATE = 1
+ESPEAK_PITCH = 3
+ESPEAK_POS_CHARACTER = 1
+ESPEAK_CHARS_UTF8 = 1
+ESPEAK_EE_OK = 0
+
+# int SynthCallback(short *wav, int numsamples, espeak_EVENT *events)
+SynthCallback = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ctypes.c_short),
+                                 ctypes.c_int, ctypes.c_void_p)
+
+# The espeak-ng C API keeps global state and is not reentrant, so the library,
+# its synth callback and the PCM it produces are shared by the whole process
+_espeak_lock = threading.Lock()
+_espeak_lib = None
+_espeak_sample_rate = None
+_espeak_loaded = False
+_pcm_buffer = bytearray()
+# Monotonic time after which the current synthesis is aborted
+_synth_deadline = None
+_synth_aborted = False
+
+def _on_synth(wav, num_samples, events) -> int:
+    """Collect PCM samples produced by libespeak-ng; returning 1 aborts synthesis"""
+    global _pcm_buffer, _synth_aborted
+    if num_samples > 0 and wav:
+        _pcm_buffer += ctypes.string_at(wav, num_samples * 2)
+    if _synth_deadline is not None and time.monotonic() > _synth_deadline:
+        _synth_aborted = True
+        return 1
+    return 0
+
+# Module-level reference so the callback is never garbage collected
+_synth_callback = SynthCallback(_on_synth)
+
+def _load_espeak_library():
+    """
+    Load and initialize libespeak-ng once per process
+    
+    Returns:
+        ctypes.CDLL: The initialized library, or None if it is unavailable
+    """
+    global _espeak_lib, _espeak_sample_rate, _espeak_loaded
+    with _espeak_lock:
+        if _espeak_loaded:
+            return _espeak_lib
+        _espeak_loaded = True
+        
+        lib_name = ctypes.util.find_library('espeak-ng') or 'libespeak-ng.so.1'
+        try:
+            lib = ctypes.CDLL(lib_name)
+        except OSError:
+            print("libespeak-ng not found, using espeak-ng subprocess")
+            return None
+        
+        lib.espeak_Initialize.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
+        lib.espeak_Initialize.restype = ctypes.c_int
+        lib.espeak_SetSynthCallback.argtypes = [SynthCallback]
+        lib.espeak_SetSynthCallback.restype = None
+        lib.espeak_SetVoiceByName.argtypes = [ctypes.c_char_p]
+        lib.espeak_SetVoiceByName.restype = ctypes.c_int
+        lib.espeak_SetParameter.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int]
+        lib.espeak_SetParameter.restype = ctypes.c_int
+        lib.espeak_Synth.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint, ctypes.c_int,
+                                     ctypes.c_uint, ctypes.c_uint, ctypes.POINTER(ctypes.c_uint),
+                                     ctypes.c_void_p]
+        lib.espeak_Synth.restype = ctypes.c_int
+        
+        sample_rate = lib.espeak_Initialize(AUDIO_OUTPUT_SYNCHRONOUS, 0, None, 0)
+        if sample_rate <= 0:
+            print("libespeak-ng failed to initialize, using espeak-ng subprocess")
+            return None
+        lib.espeak_SetSynthCallback(_synth_callback)
+        
+        _espeak_lib = lib
+        _espeak_sample_rate = sample_rate
+        print("libespeak-ng loaded for in-process synthesis")
+        return lib
+
+# Canonical 44-byte header for mono 16-bit PCM WAV
+WAV_HEADER_SIZE = 44
+# Placeholder data size for streamed WAV whose length is not known up front
+WAV_STREAM_DATA_SIZE = 0x7FFFF000
+# Disk cache writes between full rescans of the cache directory
+DISK_CACHE_SWEEP_INTERVAL = 256
+
+# Common abbreviations expanded before synthesis
+_ABBREVIATIONS = {
+    'Dr.': 'Doctor',
+    'Mr.': 'Mister',
+    'Mrs.': 'Missus',
+    'Ms.': 'Miss',
+    'Prof.': 'Professor'
+}
+_ABBREV_RE = re.compile('|'.join(re.escape(abbrev) for abbrev in _ABBREVIATIONS))
+_WS_RE = re.compile(r'\s+')
+# Sentence boundaries, including the Devanagari danda
+_SENTENCE_RE = re.compile(r'(?<=[.!?\u0964])\s+')
+
+def synthesis_timeout(text: str) -> float:
+    """Scale the espeak-ng timeout with input length, capped at 60 seconds"""
+    return min(60.0, 2.0 + len(text) / 200)
+
+def detect_language(text: str) -> str:
+    """
+    Simple language detection for Hindi vs English
+    
+    Args:
+        text (str): Input text
+        
+    Returns:
+        str: Language code ('hi' for Hindi, 'en' for English)
+    """
+    # Typical English payloads carry no Devanagari at all
+    if text.isascii():
+        return 'en'
+    
+    # Check for Devanagari script (Hindi)
+    hindi_chars = 0
+    total_chars = 0
+    
+    for char in text:
+        if char.isalpha():
+            total_chars += 1
+            # Check if character is in Devanagari range
+            if '\u0900' <= char <= '\u097F':
+                hindi_chars += 1
+    
+    # If more than 30% of alphabetic characters are Devanagari, consider it Hindi
+    if total_chars > 0 and (hindi_chars / total_chars) > 0.3:
+        return 'hi'
+    
+    return 'en'
+
 class EnhancedTTSService:
     """Enhanced TTS service using espeak-ng with multilingual support"""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None, mem_cache_bytes: int = 64 * 1024 * 1024,
+                 cache_max_bytes: int = 256 * 1024 * 1024):
         """Initialize the enhanced TTS service"""
         self.sample_rate = 22050
+
+        # Synthesis cache: bounded in-process LRU in front of an on-disk store
+        self._mem_cache = OrderedDict()
+        self._mem_cache_bytes = 0
+        self.mem_cache_max_bytes = mem_cache_bytes
+        self._cache_lock = threading.Lock()
+        if cache_dir is None:
+            cache_dir = os.environ.get("TTS_CACHE_DIR", tempfile.gettempdir())
+        self._disk_cache_dir = Path(cache_dir) / "tts-cache"
+        self.cache_max_bytes = cache_max_bytes
+        # Estimated disk cache size; None until the first scan
+        self._disk_cache_total = None
+        self._disk_writes_since_sweep = 0
         self.voice_configs = {
             'en': {
                 'alloy': {'voice': 'en+f3', 'speed': 175, 'pitch': 50},
@@ -32,7 +187,33 @@ class EnhancedTTSService:
                 'alloy': {'voice': 'hi+f1', 'speed': 165, 'pitch': 48}
             }
         }
-        self._check_espeak_availability()
+        self._espeak_available = self._check_espeak_availability()
+        
+        # In-process synthesis through libespeak-ng, with the CLI as fallback
+        self._espeak_lib = _load_espeak_library()
+    
+    def warm_up(self):
+        """
+        Run a throwaway synthesis for every configured espeak-ng voice
+        
+        Loads voice and dictionary data (and pulls it into the OS page cache)
+        at startup, so the first real request does not pay for it.
+        """
+        voices = sorted({config['voice'] for lang_voices in self.voice_configs.values()
+                         for config in lang_voices.values()})
+        
+        for voice in voices:
+            if self._espeak_lib is not None:
+                try:
+                    self._synthesize_inproc('.', {'voice': voice, 'speed': 175, 'pitch': 50})
+                except TimeoutError as e:
+                    print(f"libespeak-ng warm-up failed for {voice}: {e}")
+            if self._espeak_available:
+                try:
+                    subprocess.run(['espeak-ng', '-v', voice, '--stdout'], input=b'.',
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=5)
+                except (subprocess.TimeoutExpired, OSError) as e:
+                    print(f"espeak-ng warm-up failed for {voice}: {e}")
     
     def _check_espeak_availability(self):
         """Check if espeak-ng is available"""
@@ -68,71 +249,369 @@ class EnhancedTTSService:
             # Get voice configuration
             voice_config = self._get_voice_config(voice, language)
             
+            # Serve repeated requests from the cache
+            key = self._cache_key(text, language, voice_config)
+            audio_data = self._cache_get(key)
+            if audio_data is not None:
+                return audio_data
+            
             # Generate speech using espeak-ng
-            return self._synthesize_with_espeak(text, voice_config)
+            audio_data = self._synthesize(text, voice_config)
+            if audio_data is not None:
+                self._cache_put(key, audio_data)
+            return audio_data
             
         except Exception as e:
             print(f"Synthesis error: {e}")
             return self._generate_fallback_audio(text, language)
     
+    def synthesize_batch(self, requests: List[Tuple[str, str, str]]) -> List[Optional[bytes]]:
+        """
+        Synthesize a batch of requests back to back
+        
+        Identical requests in the batch are synthesized once, and consecutive
+        requests for the same voice reuse the dictionary already loaded by
+        libespeak-ng.
+        
+        Args:
+            requests (list): (text, language, voice) tuples
+            
+        Returns:
+            list: Audio data in WAV format (or None) for each request, in order
+        """
+        results = {}
+        for request in requests:
+            if request not in results:
+                results[request] = self.synthesize_speech(*request)
+        return [results[request] for request in requests]
+    
+    def iter_speech_chunks(self, text: str, language: str = "en", voice: str = "alloy",
+                           chunk_size: int = 4096) -> Iterator[bytes]:
+        """
+        Stream synthesized speech as it is produced by espeak-ng
+        
+        Args:
+            text (str): Input text to synthesize
+            language (str): Language code ('en' for English, 'hi' for Hindi)
+            voice (str): Voice identifier
+            chunk_size (int): Maximum size of each PCM chunk
+            
+        Yields:
+            bytes: A WAV header followed by raw 16-bit PCM chunks, or a
+            complete WAV file when the audio is already cached
+        """
+        if not text.strip():
+            return
+        
+        text = self._clean_text(text)
+        voice_config = self._get_voice_config(voice, language)
+        
+        key = self._cache_key(text, language, voice_config)
+        audio_data = self._cache_get(key)
+        if audio_data is not None:
+            yield audio_data
+            return
+        
+        cmd = [
+            'espeak-ng',
+            '-v', voice_config['voice'],
+            '-s', str(voice_config['speed']),
+            '-p', str(voice_config['pitch']),
+            '--stdout'
+        ]
+        
+        try:
+            process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                       stderr=subprocess.DEVNULL)
+        except OSError as e:
+            print(f"espeak streaming error: {e}")
+            audio_data = self.synthesize_speech(text, language, voice)
+            if audio_data is not None:
+                yield audio_data
+            return
+        
+        # Feed the text on stdin (never argv, where it could be parsed as options)
+        # from a thread so a large input cannot block against a full stdout pipe
+        def feed_stdin():
+            try:
+                process.stdin.write(text.encode('utf-8'))
+                process.stdin.close()
+            except OSError:
+                pass
+        
+        threading.Thread(target=feed_stdin, daemon=True).start()
+        
+        # Kill espeak-ng once the length-scaled timeout passes; reads then hit EOF
+        timer = threading.Timer(synthesis_timeout(text), process.kill)
+        timer.start()
+        
+        pcm = bytearray()
+        completed = False
+        try:
+            # espeak-ng cannot fill in sizes when writing to a pipe, so its
+            # header is replaced with one carrying the streaming placeholder
+            header = process.stdout.read(WAV_HEADER_SIZE)
+            if len(header) < WAV_HEADER_SIZE:
+                print("espeak-ng produced no audio")
+                return
+            sample_rate = struct.unpack_from('<I', header, 24)[0]
+            yield self._wav_header(WAV_STREAM_DATA_SIZE, sample_rate)
+            
+            while True:
+                chunk = process.stdout.read1(chunk_size)
+                if not chunk:
+                    break
+                pcm += chunk
+                yield chunk
+            completed = True
+        finally:
+            timer.cancel()
+            # Stop espeak-ng if the client went away mid-stream
+            if not completed and process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            returncode = process.wait()
+        
+        if returncode == 0:
+            self._cache_put(key, self._pcm_to_wav(bytes(pcm), sample_rate))
+    
+    def split_sentences(self, text: str) -> List[str]:
+        """Clean text and split it into sentences that can be synthesized separately"""
+        return [sentence for sentence in _SENTENCE_RE.split(self._clean_text(text)) if sentence]
+    
+    def join_wav(self, parts: List[bytes]) -> Optional[bytes]:
+        """
+        Join WAV files into one, keeping a single header
+        
+        Returns:
+            bytes: Joined WAV, or None if the parts differ in sample rate
+        """
+        sample_rates = {struct.unpack_from('<I', part, 24)[0] for part in parts}
+        if len(sample_rates) != 1:
+            return None
+        
+        pcm = [memoryview(part)[WAV_HEADER_SIZE:] for part in parts]
+        data_size = sum(len(chunk) for chunk in pcm)
+        return b''.join([self._wav_header(data_size, sample_rates.pop()), *pcm])
+    
     def _clean_text(self, text: str) -> str:
         """Clean and prepare text for synthesis"""
         # Remove excessive whitespace
-        text = ' '.join(text.split())
-        
-        # Handle common abbreviations
-        replacements = {
-            'Dr.': 'Doctor',
-            'Mr.': 'Mister', 
-            'Mrs.': 'Missus',
-            'Ms.': 'Miss',
-            'Prof.': 'Professor'
-        }
-        
-        for abbrev, expansion in replacements.items():
-            text = text.replace(abbrev, expansion)
+        text = _WS_RE.sub(' ', text).strip()
         
-        return text
+        # Handle common abbreviations in a single pass
+        return _ABBREV_RE.sub(lambda match: _ABBREVIATIONS[match.group(0)], text)
     
     def _get_voice_config(self, voice: str, language: str) -> Dict:
         """Get voice configuration for the specified voice and language"""
         lang_voices = self.voice_configs.get(language, self.voice_configs['en'])
         return lang_voices.get(voice, lang_voices['alloy'])
     
-    def _synthesize_with_espeak(self, text: str, voice_config: Dict) -> Optional[bytes]:
-        """Synthesize speech using espeak-ng"""
+    def _cache_key(self, text: str, language: str, voice_config: Dict) -> str:
+        """Build the content-addressed cache key for a synthesis request"""
+        raw = f"{text}|{voice_config['voice']}|{language}|{voice_config['speed']}|{voice_config['pitch']}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    
+    def _cache_path(self, key: str) -> Path:
+        """Get the on-disk location of a cache entry"""
+        return self._disk_cache_dir / key[:2] / f"{key}.wav"
+    
+    def _cache_get(self, key: str) -> Optional[bytes]:
+        """Look up audio in the memory cache, then on disk"""
+        with self._cache_lock:
+            audio_data = self._mem_cache.get(key)
+            if audio_data is not None:
+                self._mem_cache.move_to_end(key)
+                return audio_data
+        
+        try:
+            audio_data = self._cache_path(key).read_bytes()
+        except OSError:
+            return None
+        
+        self._mem_cache_put(key, audio_data)
+        return audio_data
+    
+    def _cache_put(self, key: str, audio_data: bytes):
+        """Store audio in the memory cache and atomically on disk"""
+        self._mem_cache_put(key, audio_data)
+        
+        path = self._cache_path(key)
+        temp_name = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=path.parent, suffix='.tmp', delete=False) as temp_file:
+                temp_name = temp_file.name
+                temp_file.write(audio_data)
+            os.replace(temp_name, path)
+        except OSError as e:
+            print(f"Cache write error: {e}")
+            # Sweeps only look at *.wav, so a failed write must clean up after itself
+            if temp_name is not None:
+                try:
+                    os.unlink(temp_name)
+                except OSError:
+                    pass
+            return
+        
+        # Only rescan the directory when the estimate is over budget, or
+        # periodically to account for writes by other processes
+        with self._cache_lock:
+            if self._disk_cache_total is not None:
+                self._disk_cache_total += len(audio_data)
+            self._disk_writes_since_sweep += 1
+            needs_sweep = (self._disk_cache_total is None
+                           or self._disk_cache_total > self.cache_max_bytes
+                           or self._disk_writes_since_sweep >= DISK_CACHE_SWEEP_INTERVAL)
+            if needs_sweep:
+                self._disk_writes_since_sweep = 0
+        
+        if needs_sweep:
+            self._sweep_disk_cache()
+    
+    def _mem_cache_put(self, key: str, audio_data: bytes):
+        """Insert into the memory cache, evicting least recently used entries"""
+        # Entries larger than the whole budget are only kept on disk
+        if len(audio_data) > self.mem_cache_max_bytes:
+            return
+        
+        with self._cache_lock:
+            previous = self._mem_cache.pop(key, None)
+            if previous is not None:
+                self._mem_cache_bytes -= len(previous)
+            self._mem_cache[key] = audio_data
+            self._mem_cache_bytes += len(audio_data)
+            while self._mem_cache_bytes > self.mem_cache_max_bytes:
+                _, evicted = self._mem_cache.popitem(last=False)
+                self._mem_cache_bytes -= len(evicted)
+    
+    def _sweep_disk_cache(self):
+        """Delete the oldest cache files once the cache exceeds cache_max_bytes"""
+        # Evict below the limit so the next writes do not trigger another sweep
+        target_bytes = int(self.cache_max_bytes * 0.9)
+        entries = []
+        total_bytes = 0
+        for path in self._disk_cache_dir.glob('*/*.wav'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+        
+        if total_bytes > self.cache_max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total_bytes -= size
+                if total_bytes <= target_bytes:
+                    break
+        
+        with self._cache_lock:
+            self._disk_cache_total = total_bytes
+    
+    def clear_cache(self) -> int:
+        """
+        Remove all cached audio from memory and disk
+        
+        Returns:
+            int: Number of on-disk entries removed
+        """
+        with self._cache_lock:
+            self._mem_cache.clear()
+            self._mem_cache_bytes = 0
+            self._disk_cache_total = 0
+        
+        removed = 0
+        for path in self._disk_cache_dir.glob('*/*.wav'):
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                continue
+        return removed
+    
+    def _synthesize(self, text: str, voice_config: Dict) -> Optional[bytes]:
+        """Synthesize in-process when libespeak-ng is loaded, else via the CLI"""
+        if self._espeak_lib is not None:
+            try:
+                audio_data = self._synthesize_inproc(text, voice_config)
+            except TimeoutError as e:
+                # Retrying on the CLI would double the time already spent
+                print(f"libespeak-ng synthesis error: {e}")
+                return None
+            if audio_data is not None:
+                return audio_data
+        return self._synthesize_with_espeak(text, voice_config)
+    
+    def _synthesize_inproc(self, text: str, voice_config: Dict) -> Optional[bytes]:
+        """Synthesize speech through the resident libespeak-ng library"""
+        global _pcm_buffer, _synth_deadline, _synth_aborted
+        lib = self._espeak_lib
+        data = text.encode('utf-8') + b'\0'
+        
         try:
-            # Create temporary file for audio output
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_path = temp_file.name
+            with _espeak_lock:
+                if lib.espeak_SetVoiceByName(voice_config['voice'].encode('utf-8')) != ESPEAK_EE_OK:
+                    print(f"libespeak-ng rejected voice: {voice_config['voice']}")
+                    return None
+                lib.espeak_SetParameter(ESPEAK_RATE, voice_config['speed'], 0)
+                lib.espeak_SetParameter(ESPEAK_PITCH, voice_config['pitch'], 0)
+                
+                _pcm_buffer = bytearray()
+                _synth_deadline = time.monotonic() + synthesis_timeout(text)
+                _synth_aborted = False
+                try:
+                    result = lib.espeak_Synth(data, len(data), 0, ESPEAK_POS_CHARACTER, 0,
+                                              ESPEAK_CHARS_UTF8, None, None)
+                finally:
+                    _synth_deadline = None
+                pcm = _pcm_buffer
+                _pcm_buffer = bytearray()
+                aborted = _synth_aborted
+            
+            if aborted:
+                raise TimeoutError(f"timed out after {synthesis_timeout(text):.1f}s")
             
-            # Build espeak command
+            if result != ESPEAK_EE_OK or not pcm:
+                print(f"libespeak-ng synthesis failed: {result}")
+                return None
+            
+            return self._pcm_to_wav(pcm, _espeak_sample_rate)
+            
+        except TimeoutError:
+            raise
+        except Exception as e:
+            print(f"In-process synthesis error: {e}")
+            return None
+    
+    def _synthesize_with_espeak(self, text: str, voice_config: Dict) -> Optional[bytes]:
+        """Synthesize speech using espeak-ng, reading the WAV from its stdout"""
+        try:
+            # Build espeak command; text is fed on stdin
             cmd = [
                 'espeak-ng',
                 '-v', voice_config['voice'],
                 '-s', str(voice_config['speed']),
                 '-p', str(voice_config['pitch']),
-                '-w', temp_path,
-                text
+                '--stdout'
             ]
             
             # Execute espeak-ng
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = subprocess.run(cmd, input=text.encode('utf-8'), capture_output=True,
+                                    timeout=synthesis_timeout(text))
             
-            if result.returncode == 0 and os.path.exists(temp_path):
-                # Read the generated audio file
-                with open(temp_path, 'rb') as audio_file:
-                    audio_data = audio_file.read()
-                
-                # Clean up temporary file
-                os.unlink(temp_path)
-                
-                return audio_data
-            else:
-                print(f"espeak-ng failed: {result.stderr}")
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
+            if result.returncode != 0 or len(result.stdout) < WAV_HEADER_SIZE:
+                print(f"espeak-ng failed: {result.stderr.decode('utf-8', 'replace')}")
                 return None
+            
+            # espeak-ng cannot seek back on a pipe, so fix up the header sizes
+            audio_data = result.stdout
+            sample_rate = struct.unpack_from('<I', audio_data, 24)[0]
+            return self._wav_header(len(audio_data) - WAV_HEADER_SIZE, sample_rate) + audio_data[WAV_HEADER_SIZE:]
                 
         except Exception as e:
             print(f"espeak synthesis error: {e}")
@@ -142,13 +621,17 @@ class EnhancedTTSService:
         """Generate simple tone-based audio as fallback"""
         duration = min(len(text) * 0.08, 10.0)  # Max 10 seconds
         
-        # Generate tone based on language
-        t = np.linspace(0, duration, int(self.sample_rate * duration))
+        # Generate tone based on language, in float32 since the output is int16
+        t = np.arange(int(self.sample_rate * duration), dtype=np.float32)
+        t /= np.float32(self.sample_rate)
         frequency = 440 if language == "en" else 523  # Different tones
         
-        # Create audio signal with envelope
-        audio = 0.3 * np.sin(2 * np.pi * frequency * t)
-        envelope = np.exp(-t / (duration / 3))
+        # Create audio signal with envelope, reusing the buffers in place
+        audio = np.multiply(t, np.float32(2 * np.pi * frequency))
+        np.sin(audio, out=audio)
+        audio *= np.float32(0.3)
+        envelope = np.multiply(t, np.float32(-3 / duration), out=t)
+        np.exp(envelope, out=envelope)
         audio *= envelope
         
         # Convert to WAV format
@@ -156,21 +639,45 @@ class EnhancedTTSService:
     
     def _numpy_to_wav(self, audio_array: np.ndarray) -> bytes:
         """Convert numpy array to WAV bytes"""
-        # Ensure audio is in the right format
-        audio_array = np.clip(audio_array, -1.0, 1.0)
-        audio_int16 = (audio_array * 32767).astype(np.int16)
+        # Scale into a scratch buffer, clip in place, then narrow to int16
+        scaled = np.multiply(audio_array, 32767.0, out=np.empty_like(audio_array))
+        np.clip(scaled, -32767.0, 32767.0, out=scaled)
+        audio_int16 = scaled.astype(np.int16, copy=False)
         
-        # Create WAV file in memory
-        buffer = io.BytesIO()
+        return self._pcm_to_wav(audio_int16.tobytes(), self.sample_rate)
+    
+    def trim_trailing_silence(self, audio_data: bytes, threshold: int = 256) -> bytes:
+        """
+        Drop the silence espeak-ng leaves at the end of an utterance
         
-        with wave.open(buffer, 'wb') as wav_file:
-            wav_file.setnchannels(1)  # Mono
-            wav_file.setsampwidth(2)  # 16-bit
-            wav_file.setframerate(self.sample_rate)
-            wav_file.writeframes(audio_int16.tobytes())
+        Args:
+            audio_data (bytes): Mono 16-bit WAV produced by this service
+            threshold (int): Sample magnitude at or below which audio counts as silent
+            
+        Returns:
+            bytes: WAV truncated after the last non-silent sample
+        """
+        pcm = np.frombuffer(audio_data, dtype='<i2', offset=WAV_HEADER_SIZE,
+                            count=(len(audio_data) - WAV_HEADER_SIZE) // 2)
+        loud = np.flatnonzero((pcm > threshold) | (pcm < -threshold))
+        data_size = (int(loud[-1]) + 1) * 2 if loud.size else 0
         
-        buffer.seek(0)
-        return buffer.getvalue()
+        # Truncate and patch the RIFF and data chunk sizes in place
+        trimmed = bytearray(audio_data[:WAV_HEADER_SIZE + data_size])
+        struct.pack_into('<I', trimmed, 4, 36 + data_size)
+        struct.pack_into('<I', trimmed, 40, data_size)
+        return bytes(trimmed)
+    
+    def _wav_header(self, data_size: int, sample_rate: int) -> bytes:
+        """Build a WAV header for mono 16-bit PCM of the given data size"""
+        return struct.pack('<4sI4s4sIHHIIHH4sI',
+                           b'RIFF', 36 + data_size, b'WAVE',
+                           b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+                           b'data', data_size)
+    
+    def _pcm_to_wav(self, pcm: bytes, sample_rate: int) -> bytes:
+        """Wrap mono 16-bit PCM in a WAV container"""
+        return self._wav_header(len(pcm), sample_rate) + pcm
     
     def get_model_info(self) -> str:
         """Get information about the TTS engine"""
@@ -201,14 +708,20 @@ class EnhancedTTSService:
         Returns:
             str: Language code ('hi' for Hindi, 'en' for English)
         """
-        if not text:
-            return 'en'
-        
-        # Count Devanagari characters for Hindi detection
-        hindi_chars = sum(1 for char in text if '\u0900' <= char <= '\u097F')
-        total_chars = len([char for char in text if char.isalpha()])
-        
-        if total_chars > 0 and (hindi_chars / total_chars) > 0.3:
-            return 'hi'
-        
-        return 'en'
+        return detect_language(text)
+
+
+# Per-process service used by synthesis pool workers
+_worker_service = None
+
+def init_worker():
+    """Create the TTS service inside a synthesis pool worker process"""
+    global _worker_service
+    # No memory cache in workers: the parent cannot clear it, so workers rely
+    # on the shared disk cache, which /v1/cache/clear does empty
+    _worker_service = EnhancedTTSService(mem_cache_bytes=0)
+    _worker_service.warm_up()
+
+def synthesize_batch_in_worker(requests: List[Tuple[str, str, str]]) -> List[Optional[bytes]]:
+    """Synthesize a batch of (text, language, voice) requests in a worker process"""
+    return _worker_service.synthesize_batch(requests)
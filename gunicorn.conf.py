@@ -0,0 +1,9 @@
+"""
+Gunicorn settings for the TTS backend
+Loaded automatically from the working directory
+"""
+
+def post_worker_init(worker):
+    """Start the TTS service in each worker before it accepts requests"""
+    from tts_app import initialize_tts
+    initialize_tts()
@@ -0,0 +1,143 @@
+"""
+Request pooling for the TTS backend
+Coalesces concurrent synthesis requests into batches grouped by voice
+"""
+
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+class RequestPool:
+    """
+    Dispatch requests in grouped batches
+
+    While an executor worker is idle, requests are dispatched immediately and
+    each key group is spread across the idle workers. Once every worker is
+    busy, requests are held for up to max_queue_delay_ms (or until a worker
+    frees up) so they can share a batch.
+    """
+
+    def __init__(self, handler: Callable[[List[Any]], List[Any]], executor: Executor,
+                 key: Optional[Callable[[Any], Hashable]] = None,
+                 max_batch_size: int = 8, max_queue_delay_ms: float = 10,
+                 parallelism: int = 1):
+        """
+        Initialize the request pool
+
+        Args:
+            handler: Picklable callable mapping a list of items to a list of results
+            executor: Executor the handler is submitted to
+            key: Function grouping items that may share a batch
+            max_batch_size (int): Dispatch as soon as this many requests are pending
+            max_queue_delay_ms (float): Longest time a request waits for a batch to fill
+                while all workers are busy
+            parallelism (int): Number of executor workers
+        """
+        self.handler = handler
+        self.executor = executor
+        self.key = key or (lambda item: None)
+        self.max_batch_size = max_batch_size
+        self.max_queue_delay = max_queue_delay_ms / 1000.0
+        self.parallelism = max(1, parallelism)
+
+        self._pending: List[Tuple[Any, Future]] = []
+        self._in_flight = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="request-pool", daemon=True)
+        self._thread.start()
+
+    def add(self, item: Any) -> Future:
+        """
+        Queue an item for batched processing
+
+        Args:
+            item: Request passed to the handler as part of a batch
+
+        Returns:
+            Future: Resolves to the handler's result for this item
+        """
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Request pool is closed")
+            self._pending.append((item, future))
+            self._condition.notify()
+        return future
+
+    def close(self):
+        """Dispatch any pending requests and stop the pool thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self):
+        """Drain pending requests into batches until the pool is closed"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+
+                # While every worker is busy, hold the window open for more
+                # requests to join the batch
+                deadline = time.monotonic() + self.max_queue_delay
+                while (len(self._pending) < self.max_batch_size and not self._closed
+                       and self._in_flight >= self.parallelism):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = self._pending[:self.max_batch_size]
+                del self._pending[:self.max_batch_size]
+                idle = self.parallelism - self._in_flight
+
+            self._dispatch(batch, max(1, idle))
+
+    def _dispatch(self, batch: List[Tuple[Any, Future]], chunks: int):
+        """Group a batch by key and submit each group in up to chunks parts"""
+        groups: Dict[Hashable, List[Tuple[Any, Future]]] = {}
+        for item, future in batch:
+            # Skip requests whose caller already gave up
+            if future.set_running_or_notify_cancel():
+                groups.setdefault(self.key(item), []).append((item, future))
+
+        for entries in groups.values():
+            # Split each group so its items run on the idle workers at once
+            chunk_size = -(-len(entries) // chunks)
+            for start in range(0, len(entries), chunk_size):
+                self._submit(entries[start:start + chunk_size])
+
+    def _submit(self, entries: List[Tuple[Any, Future]]):
+        """Submit one chunk of a group to the executor"""
+        items = [item for item, _ in entries]
+        futures = [future for _, future in entries]
+        try:
+            result = self.executor.submit(self.handler, items)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        with self._condition:
+            self._in_flight += 1
+        result.add_done_callback(lambda done: self._resolve(done, futures))
+
+    def _resolve(self, done: Future, futures: List[Future]):
+        """Distribute a finished batch's results to the waiting callers"""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+        error = done.exception()
+        if error is not None:
+            for future in futures:
+                future.set_exception(error)
+            return
+
+        for future, result in zip(futures, done.result()):
+            future.set_result(result)
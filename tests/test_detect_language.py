@@ -0,0 +1,32 @@
+"""
+Tests for language detection
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from enhanced_tts_service import detect_language
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", "en"),
+    ("Hello world", "en"),
+    ("12345 !?", "en"),
+    ("café naïve résumé", "en"),
+    ("नमस्ते दुनिया", "hi"),
+    ("आप कैसे हैं?", "hi"),
+    # Vowel signs and virama are not letters, so only base consonants count
+    ("नमस्ते hello world", "en"),
+    ("किताबें book store", "en"),
+    ("नमस्ते hello", "hi"),
+    # Devanagari digits and punctuation are not letters
+    ("१२३४५ । hello", "en"),
+    # Superscripts, fractions and Roman numerals are not letters either
+    ("²½Ⅰ नमस्ते", "hi"),
+])
+def test_detect_language(text, expected):
+    assert detect_language(text) == expected
@@ -0,0 +1,186 @@
+"""
+Tests for the request pool
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from request_pool import RequestPool
+
+
+class RecordingHandler:
+    """Handler that records every batch it receives"""
+
+    def __init__(self, delay=0.0, gate=None):
+        self.delay = delay
+        self.gate = gate
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def __call__(self, items):
+        with self._lock:
+            self.batches.append(list(items))
+        if self.gate is not None:
+            self.gate.wait(5)
+        time.sleep(self.delay)
+        return [item * 2 for item in items]
+
+
+def wait_for_batch(handler, batch):
+    """Wait until the handler has started on the given batch"""
+    deadline = time.monotonic() + 5
+    while batch not in handler.batches:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def occupy_worker(pool, handler, item):
+    """Queue an item and wait until the handler is running it"""
+    future = pool.add(item)
+    wait_for_batch(handler, [item])
+    return future
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+def test_results_match_items(executor):
+    handler = RecordingHandler()
+    pool = RequestPool(handler, executor, max_batch_size=4, max_queue_delay_ms=50)
+    futures = [pool.add(i) for i in range(4)]
+    assert [f.result(timeout=5) for f in futures] == [0, 2, 4, 6]
+    pool.close()
+
+
+def test_idle_worker_skips_queue_delay(executor):
+    handler = RecordingHandler()
+    pool = RequestPool(handler, executor, max_batch_size=8, max_queue_delay_ms=1000)
+    start = time.monotonic()
+    assert pool.add(5).result(timeout=5) == 10
+    assert time.monotonic() - start < 0.5
+    pool.close()
+
+
+def test_requests_batched_while_workers_busy(executor):
+    gate = threading.Event()
+    handler = RecordingHandler(gate=gate)
+    pool = RequestPool(handler, executor, max_batch_size=8, max_queue_delay_ms=200)
+    first = occupy_worker(pool, handler, 0)
+    futures = [pool.add(i) for i in range(1, 5)]
+    gate.set()
+    assert first.result(timeout=5) == 0
+    assert [f.result(timeout=5) for f in futures] == [2, 4, 6, 8]
+    pool.close()
+    assert handler.batches == [[0], [1, 2, 3, 4]]
+
+
+def test_busy_batch_dispatched_after_queue_delay(executor):
+    gate = threading.Event()
+    handler = RecordingHandler(gate=gate)
+    pool = RequestPool(handler, executor, max_batch_size=8, max_queue_delay_ms=20)
+    occupy_worker(pool, handler, 0)
+    future = pool.add(1)
+    wait_for_batch(handler, [1])
+    gate.set()
+    assert future.result(timeout=5) == 2
+    pool.close()
+
+
+def test_items_grouped_by_key(executor):
+    gate = threading.Event()
+    handler = RecordingHandler(gate=gate)
+    pool = RequestPool(handler, executor, key=lambda item: item % 2,
+                       max_batch_size=4, max_queue_delay_ms=200)
+    occupy_worker(pool, handler, 10)
+    futures = [pool.add(i) for i in range(4)]
+    gate.set()
+    assert [f.result(timeout=5) for f in futures] == [0, 2, 4, 6]
+    pool.close()
+    assert sorted(handler.batches) == [[0, 2], [1, 3], [10]]
+
+
+def test_group_spread_across_idle_workers(executor):
+    handler = RecordingHandler(delay=0.2)
+    pool = RequestPool(handler, executor, max_batch_size=4, max_queue_delay_ms=200,
+                       parallelism=4)
+    start = time.monotonic()
+    futures = [pool.add(i) for i in range(4)]
+    assert [f.result(timeout=5) for f in futures] == [0, 2, 4, 6]
+    elapsed = time.monotonic() - start
+    pool.close()
+    assert sorted(handler.batches) == [[0], [1], [2], [3]]
+    assert elapsed < 0.6
+
+
+def test_group_split_only_across_idle_workers(executor):
+    gate = threading.Event()
+    handler = RecordingHandler(gate=gate)
+    pool = RequestPool(handler, executor, max_batch_size=8, max_queue_delay_ms=20,
+                       parallelism=2)
+    occupy_worker(pool, handler, 10)
+    occupy_worker(pool, handler, 11)
+    futures = [pool.add(i) for i in range(4)]
+    # No worker is idle when the window closes, so the group stays one batch
+    wait_for_batch(handler, [0, 1, 2, 3])
+    gate.set()
+    assert [f.result(timeout=5) for f in futures] == [0, 2, 4, 6]
+    pool.close()
+    assert sorted(handler.batches) == [[0, 1, 2, 3], [10], [11]]
+
+
+def test_handler_exception_propagates(executor):
+    def failing(items):
+        raise ValueError("boom")
+
+    pool = RequestPool(failing, executor, max_batch_size=2, max_queue_delay_ms=200)
+    futures = [pool.add(i) for i in range(2)]
+    for f in futures:
+        with pytest.raises(ValueError):
+            f.result(timeout=5)
+    pool.close()
+
+
+def test_submit_failure_propagates():
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.shutdown()
+    pool = RequestPool(RecordingHandler(), executor, max_queue_delay_ms=1)
+    with pytest.raises(RuntimeError):
+        pool.add(1).result(timeout=5)
+    pool.close()
+
+
+def test_cancelled_request_skipped(executor):
+    gate = threading.Event()
+    handler = RecordingHandler(gate=gate)
+    pool = RequestPool(handler, executor, max_batch_size=8, max_queue_delay_ms=200)
+    occupy_worker(pool, handler, 0)
+    cancelled = pool.add(1)
+    assert cancelled.cancel()
+    kept = pool.add(2)
+    gate.set()
+    assert kept.result(timeout=5) == 4
+    pool.close()
+    assert handler.batches == [[0], [2]]
+
+
+def test_close_dispatches_pending_and_rejects_new(executor):
+    gate = threading.Event()
+    handler = RecordingHandler(gate=gate)
+    pool = RequestPool(handler, executor, max_batch_size=8, max_queue_delay_ms=10000)
+    occupy_worker(pool, handler, 0)
+    future = pool.add(3)
+    gate.set()
+    pool.close()
+    assert future.result(timeout=5) == 6
+    with pytest.raises(RuntimeError):
+        pool.add(4)
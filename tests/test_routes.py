@@ -0,0 +1,49 @@
+"""
+Tests for the HTTP endpoints
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tts_app import create_app, routes, runtime
+
+
+class StubService:
+    """Stands in for the TTS service so requests do not synthesize"""
+
+    def trim_trailing_silence(self, audio_data):
+        return audio_data
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(runtime, 'MAX_INPUT_CHARS', 10)
+    monkeypatch.setattr(routes, 'initialize_tts', lambda: StubService())
+    monkeypatch.setattr(runtime, 'synthesize', lambda text, language, voice: b'RIFF' + text.encode())
+    return create_app().test_client()
+
+
+def test_input_at_limit_accepted(client):
+    response = client.post('/v1/audio/speech', json={'input': 'a' * 10})
+    assert response.status_code == 200
+    assert response.data == b'RIFF' + b'a' * 10
+
+
+def test_input_over_limit_rejected(client):
+    response = client.post('/v1/audio/speech', json={'input': 'a' * 11})
+    assert response.status_code == 413
+    assert 'max 10 characters' in response.get_json()['error']
+
+
+def test_limit_counts_characters_not_bytes(client):
+    response = client.post('/v1/audio/speech', json={'input': 'न' * 10})
+    assert response.status_code == 200
+
+
+def test_empty_input_rejected(client):
+    response = client.post('/v1/audio/speech', json={'input': '   '})
+    assert response.status_code == 400
@@ -0,0 +1,109 @@
+"""
+Tests for the synthesis cache
+"""
+
+import errno
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import enhanced_tts_service
+from enhanced_tts_service import EnhancedTTSService
+
+
+def make_service(tmp_path, **kwargs):
+    return EnhancedTTSService(cache_dir=str(tmp_path), **kwargs)
+
+
+def key(n):
+    return f"{n:064x}"
+
+
+def disk_files(service, pattern):
+    return sorted(service._disk_cache_dir.glob(f'*/{pattern}'))
+
+
+def test_memory_cache_bounded_by_bytes(tmp_path):
+    service = make_service(tmp_path, mem_cache_bytes=100)
+    for n in range(3):
+        service._mem_cache_put(key(n), bytes(40))
+    assert list(service._mem_cache) == [key(1), key(2)]
+    assert service._mem_cache_bytes == 80
+
+
+def test_memory_cache_evicts_least_recently_used(tmp_path):
+    service = make_service(tmp_path, mem_cache_bytes=100)
+    service._mem_cache_put(key(0), bytes(40))
+    service._mem_cache_put(key(1), bytes(40))
+    assert service._cache_get(key(0)) == bytes(40)
+    service._mem_cache_put(key(2), bytes(40))
+    assert list(service._mem_cache) == [key(0), key(2)]
+
+
+def test_memory_cache_replacing_entry_updates_size(tmp_path):
+    service = make_service(tmp_path, mem_cache_bytes=100)
+    service._mem_cache_put(key(0), bytes(40))
+    service._mem_cache_put(key(0), bytes(10))
+    assert service._mem_cache_bytes == 10
+
+
+def test_entry_larger_than_memory_budget_kept_on_disk_only(tmp_path):
+    service = make_service(tmp_path, mem_cache_bytes=100)
+    service._cache_put(key(0), bytes(200))
+    assert key(0) not in service._mem_cache
+    assert service._cache_get(key(0)) == bytes(200)
+
+
+def test_disabled_memory_cache_reads_disk(tmp_path):
+    service = make_service(tmp_path, mem_cache_bytes=0)
+    service._cache_put(key(0), b'audio')
+    assert not service._mem_cache
+    assert service._cache_get(key(0)) == b'audio'
+
+
+def test_disk_cache_evicts_oldest_to_90_percent(tmp_path):
+    service = make_service(tmp_path, cache_max_bytes=1000)
+    for n in range(5):
+        service._cache_put(key(n), bytes(200))
+        os.utime(service._cache_path(key(n)), (n, n))
+    assert len(disk_files(service, '*.wav')) == 5
+
+    # 1200 bytes is over the cap; the oldest entries go until at most 900 remain
+    service._cache_put(key(5), bytes(200))
+    remaining = {path.name for path in disk_files(service, '*.wav')}
+    assert remaining == {f"{key(n)}.wav" for n in range(2, 6)}
+    assert service._disk_cache_total == 800
+
+
+def test_disk_write_is_atomic(tmp_path):
+    service = make_service(tmp_path)
+    service._cache_put(key(0), b'first')
+    service._cache_put(key(0), b'second')
+    assert service._cache_path(key(0)).read_bytes() == b'second'
+    assert disk_files(service, '*.tmp') == []
+
+
+def test_failed_disk_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    service = make_service(tmp_path)
+
+    def replace(src, dst):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(enhanced_tts_service.os, 'replace', replace)
+    service._cache_put(key(0), b'audio')
+    assert disk_files(service, '*') == []
+    # The memory cache still serves the entry
+    assert service._cache_get(key(0)) == b'audio'
+
+
+def test_clear_cache(tmp_path):
+    service = make_service(tmp_path)
+    for n in range(3):
+        service._cache_put(key(n), b'audio')
+    assert service.clear_cache() == 3
+    assert not service._mem_cache
+    assert service._mem_cache_bytes == 0
+    assert service._cache_get(key(0)) is None
@@ -0,0 +1,56 @@
+"""
+Tests for the synthesis time bound
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import enhanced_tts_service
+from enhanced_tts_service import EnhancedTTSService, synthesis_timeout
+
+
+@pytest.mark.parametrize("length, expected", [
+    (0, 2.0),
+    (200, 3.0),
+    (5000, 27.0),
+    (11600, 60.0),
+    (50000, 60.0),
+])
+def test_synthesis_timeout_scales_with_length(length, expected):
+    assert synthesis_timeout('a' * length) == pytest.approx(expected)
+
+
+def test_callback_aborts_past_deadline(monkeypatch):
+    monkeypatch.setattr(enhanced_tts_service, '_synth_aborted', False)
+    monkeypatch.setattr(enhanced_tts_service, '_synth_deadline', time.monotonic() - 1)
+    assert enhanced_tts_service._on_synth(None, 0, None) == 1
+    assert enhanced_tts_service._synth_aborted
+
+
+def test_callback_continues_before_deadline(monkeypatch):
+    monkeypatch.setattr(enhanced_tts_service, '_synth_aborted', False)
+    monkeypatch.setattr(enhanced_tts_service, '_synth_deadline', time.monotonic() + 60)
+    assert enhanced_tts_service._on_synth(None, 0, None) == 0
+    monkeypatch.setattr(enhanced_tts_service, '_synth_deadline', None)
+    assert enhanced_tts_service._on_synth(None, 0, None) == 0
+    assert not enhanced_tts_service._synth_aborted
+
+
+def test_inproc_timeout_not_retried_on_cli(tmp_path, monkeypatch):
+    service = EnhancedTTSService(cache_dir=str(tmp_path))
+    cli_calls = []
+
+    def timed_out(text, voice_config):
+        raise TimeoutError("timed out")
+
+    monkeypatch.setattr(service, '_espeak_lib', object())
+    monkeypatch.setattr(service, '_synthesize_inproc', timed_out)
+    monkeypatch.setattr(service, '_synthesize_with_espeak',
+                        lambda text, voice_config: cli_calls.append(text))
+    assert service._synthesize('hello', service._get_voice_config('alloy', 'en')) is None
+    assert cli_calls == []
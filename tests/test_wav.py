@@ -0,0 +1,77 @@
+"""
+Tests for WAV output helpers
+"""
+
+import io
+import os
+import struct
+import sys
+import wave
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from enhanced_tts_service import EnhancedTTSService, WAV_HEADER_SIZE
+
+
+@pytest.fixture(scope="module")
+def service(tmp_path_factory):
+    return EnhancedTTSService(cache_dir=str(tmp_path_factory.mktemp("cache")))
+
+
+def make_wav(service, samples, sample_rate=22050):
+    return service._pcm_to_wav(np.array(samples, dtype='<i2').tobytes(), sample_rate)
+
+
+def header_sizes(audio_data):
+    return struct.unpack_from('<I', audio_data, 4)[0], struct.unpack_from('<I', audio_data, 40)[0]
+
+
+def test_pcm_to_wav_is_readable(service):
+    audio_data = make_wav(service, [0, 1000, -1000, 0], sample_rate=16000)
+    with wave.open(io.BytesIO(audio_data)) as reader:
+        assert reader.getnchannels() == 1
+        assert reader.getsampwidth() == 2
+        assert reader.getframerate() == 16000
+        assert reader.getnframes() == 4
+
+
+def test_trim_drops_trailing_silence(service):
+    audio_data = make_wav(service, [0, 1000, -2000, 100, 0, 0])
+    trimmed = service.trim_trailing_silence(audio_data)
+    assert trimmed[WAV_HEADER_SIZE:] == np.array([0, 1000, -2000], dtype='<i2').tobytes()
+    assert header_sizes(trimmed) == (36 + 6, 6)
+    assert trimmed[:4] == b'RIFF' and trimmed[8:12] == b'WAVE'
+    assert struct.unpack_from('<I', trimmed, 24)[0] == 22050
+
+
+def test_trim_threshold_is_inclusive(service):
+    audio_data = make_wav(service, [1000, 256, -256, 257, 0])
+    trimmed = service.trim_trailing_silence(audio_data)
+    assert header_sizes(trimmed) == (36 + 8, 8)
+
+
+def test_trim_all_silent(service):
+    audio_data = make_wav(service, [0, 10, -10, 0])
+    trimmed = service.trim_trailing_silence(audio_data)
+    assert len(trimmed) == WAV_HEADER_SIZE
+    assert header_sizes(trimmed) == (36, 0)
+
+
+def test_trim_empty_data(service):
+    trimmed = service.trim_trailing_silence(make_wav(service, []))
+    assert header_sizes(trimmed) == (36, 0)
+
+
+def test_trim_odd_length_data(service):
+    audio_data = make_wav(service, [1000, 0]) + b'\x7f'
+    trimmed = service.trim_trailing_silence(audio_data)
+    assert trimmed[WAV_HEADER_SIZE:] == struct.pack('<h', 1000)
+    assert header_sizes(trimmed) == (36 + 2, 2)
+
+
+def test_trim_keeps_fully_loud_audio(service):
+    audio_data = make_wav(service, [1000, -1000, 1000])
+    assert service.trim_trailing_silence(audio_data) == audio_data
@@ -0,0 +1,51 @@
+"""
+TTS backend application package
+Builds the Flask app shared by every entrypoint
+"""
+
+from flask import Flask
+from flask_cors import CORS
+from flask_compress import Compress
+import logging
+from . import runtime
+from .runtime import initialize_tts, json_response
+from .routes import bp_openai, bp_api, bp_admin
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+
+def create_app() -> Flask:
+    """
+    Create the TTS backend Flask app
+    
+    Returns:
+        Flask: App with the OpenAI-compatible and metadata routes, plus the
+        admin routes when TTS_ADMIN_TOKEN is set
+    """
+    app = Flask(__name__)
+    CORS(app)  # Enable CORS for frontend access
+    Compress(app)  # gzip/brotli for JSON responses
+    
+    app.register_blueprint(bp_openai)
+    app.register_blueprint(bp_api)
+    if runtime.ADMIN_TOKEN:
+        app.register_blueprint(bp_admin)
+    
+    @app.errorhandler(404)
+    def not_found(error):
+        """Handle 404 errors"""
+        return json_response({"error": "Endpoint not found"}), 404
+    
+    @app.errorhandler(500)
+    def internal_error(error):
+        """Handle 500 errors"""
+        return json_response({"error": "Internal server error"}), 500
+    
+    @app.errorhandler(405)
+    def method_not_allowed(error):
+        """Handle 405 errors"""
+        return json_response({"error": "Method not allowed"}), 405
+    
+    return app
+
+__all__ = ["create_app", "initialize_tts"]
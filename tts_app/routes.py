@@ -0,0 +1,182 @@
+"""
+HTTP endpoints for the TTS backend
+OpenAI-compatible routes, service metadata and admin operations
+"""
+
+from flask import Blueprint, request, Response
+from itertools import chain
+import hmac
+import time
+import logging
+from enhanced_tts_service import detect_language
+from . import runtime
+from .runtime import json_response, static_json_response, initialize_tts
+
+logger = logging.getLogger(__name__)
+
+bp_openai = Blueprint('openai', __name__)
+bp_api = Blueprint('api', __name__)
+bp_admin = Blueprint('admin', __name__)
+
+@bp_api.route('/health', methods=['GET'])
+def health_check():
+    """Health check endpoint"""
+    return json_response({
+        "status": "healthy",
+        "service": "TTS API Backend",
+        "timestamp": time.time(),
+        "version": "1.0.0"
+    })
+
+@bp_openai.route('/v1/audio/speech', methods=['POST'])
+def create_speech():
+    """
+    OpenAI-compatible TTS endpoint
+    
+    Expected request body:
+    {
+        "model": "tts-1",
+        "input": "The text to synthesize",
+        "voice": "alloy",
+        "response_format": "wav",
+        "stream": false
+    }
+    
+    With "stream": true the WAV is sent with chunked transfer encoding as
+    espeak-ng produces it, instead of after synthesis completes.
+    
+    Query parameters:
+        trim=1: Strip trailing silence (ignored when streaming)
+    """
+    try:
+        # Parse request
+        data = request.get_json()
+        
+        if not data:
+            return json_response({"error": "No JSON data provided"}), 400
+        
+        # Extract parameters
+        text = data.get('input', '')
+        model = data.get('model', 'tts-1')
+        voice = data.get('voice', 'alloy')
+        response_format = data.get('response_format', 'wav')
+        speed = data.get('speed', 1.0)
+        stream = bool(data.get('stream', False))
+        
+        # Validate input
+        if len(text) > runtime.MAX_INPUT_CHARS:
+            return json_response({
+                "error": f"Input too long (max {runtime.MAX_INPUT_CHARS} characters)"
+            }), 413
+        
+        if not text.strip():
+            return json_response({"error": "Input text is required"}), 400
+        
+        # Detect language
+        language = detect_language(text)
+        
+        logger.info(f"Synthesizing text: '{text[:50]}...' in language: {language}")
+        
+        # Initialize TTS service if needed
+        tts = initialize_tts()
+        
+        # Determine content type based on format
+        content_type = {
+            'mp3': 'audio/mpeg',
+            'wav': 'audio/wav',
+            'opus': 'audio/opus',
+            'aac': 'audio/aac',
+            'flac': 'audio/flac'
+        }.get(response_format, 'audio/wav')
+        
+        if stream:
+            chunks = tts.iter_speech_chunks(text, language, voice)
+            
+            # Wait for the first chunk so failures still get an error status
+            first_chunk = next(chunks, None)
+            if first_chunk is None:
+                return json_response({"error": "Failed to generate speech"}), 500
+            
+            # No Content-Length: the body is sent with chunked transfer encoding
+            return Response(
+                chain([first_chunk], chunks),
+                mimetype=content_type,
+                headers={
+                    'Content-Disposition': f'attachment; filename="speech.{response_format}"',
+                    'Access-Control-Allow-Origin': '*'
+                }
+            )
+        
+        # Generate speech in the worker pool, batched with concurrent requests
+        audio_data = runtime.synthesize(text, language, voice)
+        
+        if audio_data is None:
+            return json_response({"error": "Failed to generate speech"}), 500
+        
+        if request.args.get('trim') == '1':
+            audio_data = tts.trim_trailing_silence(audio_data)
+        
+        # Return audio as streaming response
+        return Response(
+            audio_data,
+            mimetype=content_type,
+            headers={
+                'Content-Disposition': f'attachment; filename="speech.{response_format}"',
+                'Content-Length': str(len(audio_data)),
+                'Access-Control-Allow-Origin': '*'
+            }
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in create_speech: {str(e)}")
+        return json_response({"error": f"Internal server error: {str(e)}"}), 500
+
+@bp_openai.route('/v1/models', methods=['GET'])
+def list_models():
+    """List available TTS models (OpenAI-compatible)"""
+    return static_json_response(runtime.MODELS_JSON, runtime.MODELS_ETAG)
+
+@bp_openai.route('/v1/voices', methods=['GET'])
+def list_voices():
+    """List available voices"""
+    initialize_tts()
+    return static_json_response(runtime.VOICES_JSON, runtime.VOICES_ETAG)
+
+@bp_api.route('/api/languages', methods=['GET'])
+def get_languages():
+    """Get supported languages"""
+    initialize_tts()
+    return static_json_response(runtime.LANGS_JSON, runtime.LANGS_ETAG)
+
+@bp_api.route('/api/status', methods=['GET'])
+def get_status():
+    """Get service status and capabilities"""
+    tts = initialize_tts()
+    return json_response({
+        "status": "ready" if tts.is_ready() else "not_ready",
+        "engine": tts.get_model_info(),
+        "supported_languages": tts.get_supported_languages(),
+        "supported_voices": tts.get_supported_voices(),
+        "capabilities": {
+            "streaming": True,
+            "multiple_voices": True,
+            "language_detection": True,
+            "openai_compatible": True
+        }
+    })
+
+@bp_admin.before_request
+def require_admin_token():
+    """Reject admin requests without the configured bearer token"""
+    expected = f"Bearer {runtime.ADMIN_TOKEN}"
+    provided = request.headers.get('Authorization', '')
+    if not runtime.ADMIN_TOKEN or not hmac.compare_digest(provided.encode(), expected.encode()):
+        return json_response({"error": "Unauthorized"}), 401
+
+@bp_admin.route('/v1/cache/clear', methods=['POST'])
+def clear_cache():
+    """Clear the synthesis cache (admin)"""
+    tts = initialize_tts()
+    removed = tts.clear_cache()
+    logger.info(f"Cleared synthesis cache ({removed} files)")
+    return json_response({"status": "cleared", "removed": removed})
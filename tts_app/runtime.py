@@ -0,0 +1,174 @@
+"""
+Shared runtime state for the TTS backend
+Owns the TTS service, the synthesis worker pool and the request pool
+"""
+
+from flask import Response, request
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import hashlib
+import multiprocessing
+import threading
+import logging
+import time
+import os
+import orjson
+from enhanced_tts_service import EnhancedTTSService, init_worker, synthesize_batch_in_worker
+from request_pool import RequestPool
+
+logger = logging.getLogger(__name__)
+
+# Global TTS service instance
+tts_service = None
+
+# Process pool running CPU-bound synthesis outside the request threads. Every
+# gunicorn worker owns a pool, so by default they split the cores between them
+WEB_WORKERS = max(1, int(os.environ.get("WEB_CONCURRENCY", 1)))
+SYNTH_WORKERS = int(os.environ.get("TTS_SYNTH_WORKERS", max(1, (os.cpu_count() or 1) // WEB_WORKERS)))
+EXECUTOR = None
+
+# Coalesces concurrent requests into per-voice batches for the worker pool
+MAX_BATCH_SIZE = int(os.environ.get("TTS_MAX_BATCH_SIZE", 8))
+MAX_QUEUE_DELAY_MS = float(os.environ.get("TTS_MAX_QUEUE_DELAY_MS", 10))
+SYNTH_TIMEOUT = 60
+# Bearer token for the admin routes; they are not registered without one
+ADMIN_TOKEN = os.environ.get("TTS_ADMIN_TOKEN")
+# Longest accepted input, bounding per-request synthesis work
+MAX_INPUT_CHARS = int(os.environ.get("TTS_MAX_INPUT", "5000"))
+REQUEST_POOL = None
+_init_lock = threading.Lock()
+
+# Serialized bodies of the static metadata endpoints
+MODELS_JSON = orjson.dumps({
+    "object": "list",
+    "data": [
+        {
+            "id": "tts-1",
+            "object": "model",
+            "created": 1677610602,
+            "owned_by": "enhanced-tts"
+        },
+        {
+            "id": "tts-1-hd",
+            "object": "model",
+            "created": 1677610602,
+            "owned_by": "enhanced-tts"
+        }
+    ]
+})
+MODELS_ETAG = hashlib.md5(MODELS_JSON).hexdigest()
+VOICES_JSON = None
+VOICES_ETAG = None
+LANGS_JSON = None
+LANGS_ETAG = None
+
+# How long clients and proxies may reuse the static metadata responses
+STATIC_MAX_AGE = 300
+
+def json_response(obj):
+    """Serialize obj into a JSON response"""
+    return Response(orjson.dumps(obj), mimetype='application/json')
+
+def static_json_response(body, etag):
+    """Return a pre-serialized JSON body with caching headers"""
+    response = Response(body, mimetype='application/json')
+    response.headers['Cache-Control'] = f'public, max-age={STATIC_MAX_AGE}'
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+def _build_static_payloads(tts):
+    """Serialize the voice and language lists once per process"""
+    global VOICES_JSON, VOICES_ETAG, LANGS_JSON, LANGS_ETAG
+    
+    voice_list = []
+    for lang, voice_names in tts.get_supported_voices().items():
+        for voice_name in voice_names:
+            voice_list.append({
+                "id": voice_name,
+                "name": voice_name.title(),
+                "language": lang,
+                "description": f"Voice for {lang.upper()} language"
+            })
+    
+    VOICES_JSON = orjson.dumps({"voices": voice_list})
+    LANGS_JSON = orjson.dumps({
+        "languages": tts.get_supported_languages(),
+        "default": "en"
+    })
+    VOICES_ETAG = hashlib.md5(VOICES_JSON).hexdigest()
+    LANGS_ETAG = hashlib.md5(LANGS_JSON).hexdigest()
+
+def _start_pools():
+    """Create the synthesis worker pool and the request pool feeding it"""
+    global EXECUTOR, REQUEST_POOL
+    EXECUTOR = ProcessPoolExecutor(
+        max_workers=SYNTH_WORKERS,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=init_worker
+    )
+    # Launch every worker now so they all warm up before the first request.
+    # The pool spawns a process per submit only while none is idle, so submit
+    # one task per worker back to back
+    for _ in range(SYNTH_WORKERS):
+        EXECUTOR.submit(int)
+    REQUEST_POOL = RequestPool(
+        synthesize_batch_in_worker,
+        EXECUTOR,
+        key=lambda item: (item[1], item[2]),
+        max_batch_size=MAX_BATCH_SIZE,
+        max_queue_delay_ms=MAX_QUEUE_DELAY_MS,
+        parallelism=SYNTH_WORKERS
+    )
+
+def restart_pools(broken_executor):
+    """Replace the pools after a worker died, unless another thread already did"""
+    with _init_lock:
+        if EXECUTOR is not broken_executor:
+            return
+        logger.warning("Synthesis worker pool is broken, restarting it")
+        REQUEST_POOL.close()
+        EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        _start_pools()
+
+def _run_in_pool(items):
+    """Run (text, language, voice) items in the worker pool, restarting it once if it broke"""
+    for attempt in range(2):
+        executor, pool = EXECUTOR, REQUEST_POOL
+        try:
+            futures = [pool.add(item) for item in items]
+            deadline = time.monotonic() + SYNTH_TIMEOUT
+            return [future.result(timeout=max(0, deadline - time.monotonic()))
+                    for future in futures]
+        except BrokenProcessPool:
+            if attempt:
+                raise
+            restart_pools(executor)
+        except RuntimeError:
+            # A concurrent restart closed the pool this request was queued on
+            if attempt or pool is REQUEST_POOL:
+                raise
+
+def synthesize(text, language, voice):
+    """Synthesize text in the worker pool, one sentence per task for long inputs"""
+    sentences = tts_service.split_sentences(text)
+    if len(sentences) > 1 and SYNTH_WORKERS > 1:
+        results = _run_in_pool([(sentence, language, voice) for sentence in sentences])
+        if any(audio_data is None for audio_data in results):
+            return None
+        audio_data = tts_service.join_wav(results)
+        if audio_data is not None:
+            return audio_data
+        # Sentences fell back to audio of different sample rates; redo as one
+    return _run_in_pool([(text, language, voice)])[0]
+
+def initialize_tts():
+    """Initialize TTS service, synthesis worker pool and request pool"""
+    global tts_service
+    with _init_lock:
+        if tts_service is None:
+            tts_service = EnhancedTTSService()
+            tts_service.warm_up()
+            _build_static_payloads(tts_service)
+        if EXECUTOR is None:
+            _start_pools()
+    return tts_service